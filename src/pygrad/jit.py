@@ -0,0 +1,145 @@
+import math
+from collections.abc import Callable, Sequence
+from typing import cast
+
+from pygrad.math import (
+    CONSTANT,
+    Add,
+    Affine,
+    Div,
+    Mul,
+    Op,
+    Pow,
+    Relu,
+    Scalar,
+    Sigmoid,
+    Sub,
+    Tanh,
+    _pow_base_grad,
+    _sigmoid,
+)
+
+# Templates refer to operand values as {0}, {1}, ..., to the op's output value
+# as {out} and to the output gradient as {g}.
+_FORWARD: dict[type[Op], str] = {
+    Add: "{0} + {1}",
+    Sub: "{0} - {1}",
+    Mul: "{0} * {1}",
+    Div: "{0} / {1}",
+    Pow: "{0} ** {1}",
+    Tanh: "_tanh({0})",
+    Sigmoid: "_sigmoid({0})",
+    Relu: "{0} if {0} > 0 else 0.0",
+}
+
+_BACKWARD: dict[type[Op], tuple[str, ...]] = {
+    Add: ("{g}", "{g}"),
+    Sub: ("{g}", "-{g}"),
+    Mul: ("{1} * {g}", "{0} * {g}"),
+    Div: ("{g} / {1}", "-{out} / {1} * {g}"),
+    Tanh: ("(1.0 - {out} * {out}) * {g}",),
+    Sigmoid: ("{out} * (1.0 - {out}) * {g}",),
+    Relu: ("{g} if {0} > 0 else 0.0",),
+}
+
+
+def _forward_expr(op: Op, args: list[str]) -> str:
+    if isinstance(op, Affine):
+        # Mirror Affine's own forward so traced values match out.data exactly.
+        n = len(op.weights)
+        weights, inputs = ", ".join(args[:n]), ", ".join(args[n : 2 * n])
+        return f"{args[-1]} + _sumprod([{weights}], [{inputs}])"
+
+    template = _FORWARD.get(type(op))
+    if template is None:
+        raise TypeError(f"cannot trace op of type {type(op).__name__}")
+    return template.format(*args)
+
+
+def _backward_exprs(op: Op, args: list[str], out: str, g: str) -> list[str]:
+    if isinstance(op, Affine):
+        n = len(op.weights)
+        weights, inputs = args[:n], args[n : 2 * n]
+        weight_grads = [f"{x} * {g}" for x in inputs]
+        input_grads = [f"{w} * {g}" for w in weights]
+        return [*weight_grads, *input_grads, g]
+
+    if isinstance(op, Pow):
+        # Share the engine's base gradient so both raise on the same inputs.
+        literal = op.right.op is CONSTANT
+        base_grad = f"_pow_base_grad({args[0]}, {args[1]}, {out}, {literal}) * {g}"
+        if literal:
+            return [base_grad]
+        return [base_grad, f"{out} * _log({args[0]}) * {g}"]
+
+    return [t.format(*args, out=out, g=g) for t in _BACKWARD[type(op)]]
+
+
+def trace(
+    root: Scalar, inputs: Sequence[Scalar]
+) -> tuple[Callable[..., float], Callable[..., list[float]]]:
+    if any(x.op.operands for x in inputs):
+        raise ValueError("inputs must be leaf scalars")
+    if len({id(x) for x in inputs}) != len(inputs):
+        raise ValueError("inputs must not contain duplicates")
+
+    # The engine orders each node before its operands; reversed, every operand
+    # is evaluated before the ops that consume it.
+    topo = root._topological_order()[::-1]
+    index = {id(node): i for i, node in enumerate(topo)}
+    input_ids = {id(x) for x in inputs}
+    namespace: dict[str, object] = {
+        "_log": math.log,
+        "_pow_base_grad": _pow_base_grad,
+        "_sigmoid": _sigmoid,
+        "_sumprod": math.sumprod,
+        "_tanh": math.tanh,
+    }
+
+    # Leaves that are not inputs are frozen at their current data; only inputs
+    # and interior nodes carry gradients.
+    def tracks_grad(node: Scalar) -> bool:
+        return bool(node.op.operands) or id(node) in input_ids
+
+    forward_lines = []
+    for node in topo:
+        i, op = index[id(node)], node.op
+        if not op.operands:
+            if id(node) not in input_ids:
+                namespace[f"v{i}"] = node.data
+            continue
+
+        args = [f"v{index[id(operand)]}" for operand in op.operands]
+        forward_lines.append(f"v{i} = {_forward_expr(op, args)}")
+
+    backward_lines = [f"g{index[id(node)]} = 0.0" for node in topo if tracks_grad(node)]
+    backward_lines.append(f"g{index[id(root)]} = 1.0")
+    for node in reversed(topo):
+        i, op = index[id(node)], node.op
+        if not op.operands:
+            continue
+
+        args = [f"v{index[id(operand)]}" for operand in op.operands]
+        exprs = _backward_exprs(op, args, out=f"v{i}", g=f"g{i}")
+        for operand, grad in zip(op.operands, exprs):
+            if tracks_grad(operand):
+                backward_lines.append(f"g{index[id(operand)]} += {grad}")
+
+    params = ", ".join(
+        f"v{index[id(x)]}" if id(x) in index else f"_{j}" for j, x in enumerate(inputs)
+    )
+    grads = ", ".join(f"g{index[id(x)]}" if id(x) in index else "0.0" for x in inputs)
+    source = "\n".join(
+        [
+            f"def forward({params}):",
+            *(f"    {line}" for line in forward_lines),
+            f"    return v{index[id(root)]}",
+            f"def backward({params}):",
+            *(f"    {line}" for line in forward_lines + backward_lines),
+            f"    return [{grads}]",
+        ]
+    )
+    exec(compile(source, "<pygrad.jit>", "exec"), namespace)
+    forward = cast(Callable[..., float], namespace["forward"])
+    backward = cast(Callable[..., list[float]], namespace["backward"])
+    return forward, backward
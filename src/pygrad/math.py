@@ -1,171 +1,221 @@
+import itertools
 import math
 from abc import ABC, abstractmethod
-from typing import Callable, ClassVar, override
+from collections.abc import Sequence
+from typing import ClassVar, override
 
 
 def _sigmoid(x: float) -> float:
-    if x >= 0.0:
-        z = math.exp(-x)
-        return 1.0 / (1.0 + z)
-    z = math.exp(x)
-    return z / (1.0 + z)
+    # exp(-|x|) never overflows and serves both signs.
+    z = math.exp(-abs(x))
+    return 1.0 / (1.0 + z) if x >= 0.0 else z / (1.0 + z)
+
+
+def _pow_base_grad(x: float, y: float, out: float, literal: bool) -> float:
+    if literal:
+        # A literal exponent needs no gradient, so log(x) is skipped and
+        # non-positive bases such as (a - b) ** 2 are allowed while the
+        # derivative stays real.
+        if x == 0.0:
+            if y == 0.0:
+                return 0.0
+            if y < 1.0:
+                raise ValueError(
+                    "Pow.backward requires an exponent of at least 1 for a zero base."
+                )
+            return y * x ** (y - 1.0)
+        if x < 0.0 and not y.is_integer():
+            raise ValueError(
+                "Pow.backward requires an integer exponent for a negative base."
+            )
+    elif x <= 0.0:
+        raise ValueError(
+            "Pow.backward requires a positive base for exponent gradients."
+        )
+    # x ** (y - 1) == out / x for any nonzero x, which saves a second pow.
+    return y * (out / x)
 
 
 class Op(ABC):
+    __slots__ = ("out", "operands")
+
     symbol: ClassVar[str] = "?"
 
     out: "Scalar"
+    operands: tuple["Scalar", ...]
 
     @abstractmethod
     def backward(self) -> None:
         pass
 
-    @property
-    @abstractmethod
-    def operands(self) -> tuple["Scalar", ...]:
-        pass
-
 
 class NoOp(Op):
+    __slots__ = ()
+
     symbol: ClassVar[str] = "noop"
 
+    def __init__(self) -> None:
+        self.operands = ()
+
     @override
     def backward(self) -> None:
         pass
 
-    @property
-    @override
-    def operands(self) -> tuple["Scalar", ...]:
-        return ()
-
 
 NO_OP = NoOp()
 
 
+class Constant(NoOp):
+    __slots__ = ()
+
+    symbol: ClassVar[str] = "const"
+
+
+# Marks leaves created from Python numbers, which never need gradients.
+CONSTANT = Constant()
+
+_EPOCHS = itertools.count(1)
+
+
 class BinaryOp(Op):
+    __slots__ = ("left", "right")
+
     def __init__(
         self,
         left: "Scalar",
         right: "Scalar",
-        forward_fn: Callable[[float, float], float],
+        data: float,
     ) -> None:
         self.left = left
         self.right = right
-        self.out = Scalar(forward_fn(left.data, right.data), op=self)
-
-    @property
-    @override
-    def operands(self) -> tuple["Scalar", ...]:
-        return (self.left, self.right)
+        self.operands = (left, right)
+        self.out = Scalar(data, op=self)
 
 
 class UnaryOp(Op):
-    def __init__(self, operand: "Scalar", forward_fn: Callable[[float], float]) -> None:
-        self.operand = operand
-        self.out = Scalar(forward_fn(operand.data), op=self)
+    __slots__ = ("operand",)
 
-    @property
-    @override
-    def operands(self) -> tuple["Scalar", ...]:
-        return (self.operand,)
+    def __init__(self, operand: "Scalar", data: float) -> None:
+        self.operand = operand
+        self.operands = (operand,)
+        self.out = Scalar(data, op=self)
 
 
 class Add(BinaryOp):
+    __slots__ = ()
+
     symbol: ClassVar[str] = "+"
 
     def __init__(self, left: "Scalar", right: "Scalar") -> None:
-        super().__init__(left, right, lambda x, y: x + y)
+        super().__init__(left, right, left.data + right.data)
 
     @override
     def backward(self) -> None:
-        self.left.grad += 1.0 * self.out.grad
-        self.right.grad += 1.0 * self.out.grad
+        g = self.out.grad
+        self.left.grad += g
+        self.right.grad += g
 
 
 class Sub(BinaryOp):
+    __slots__ = ()
+
     symbol: ClassVar[str] = "-"
 
     def __init__(self, left: "Scalar", right: "Scalar") -> None:
-        super().__init__(left, right, lambda x, y: x - y)
+        super().__init__(left, right, left.data - right.data)
 
     @override
     def backward(self) -> None:
-        self.left.grad += 1.0 * self.out.grad
-        self.right.grad -= 1.0 * self.out.grad
+        g = self.out.grad
+        self.left.grad += g
+        self.right.grad -= g
 
 
 class Mul(BinaryOp):
+    __slots__ = ()
+
     symbol: ClassVar[str] = "*"
 
     def __init__(self, left: "Scalar", right: "Scalar") -> None:
-        super().__init__(left, right, lambda x, y: x * y)
+        super().__init__(left, right, left.data * right.data)
 
     @override
     def backward(self) -> None:
-        self.left.grad += self.right.data * self.out.grad
-        self.right.grad += self.left.data * self.out.grad
+        left, right, g = self.left, self.right, self.out.grad
+        left.grad += right.data * g
+        right.grad += left.data * g
 
 
 class Div(BinaryOp):
+    __slots__ = ()
+
     symbol: ClassVar[str] = "/"
 
     def __init__(self, left: "Scalar", right: "Scalar") -> None:
-        super().__init__(left, right, lambda x, y: x / y)
+        super().__init__(left, right, left.data / right.data)
 
     @override
     def backward(self) -> None:
-        self.left.grad += (1.0 / self.right.data) * self.out.grad
-        self.right.grad += (-self.left.data / (self.right.data**2)) * self.out.grad
+        # d(x / y)/dy == -(x / y) / y, so both gradients share one reciprocal.
+        inv, g = 1.0 / self.right.data, self.out.grad
+        self.left.grad += inv * g
+        self.right.grad -= self.out.data * inv * g
 
 
 class Pow(BinaryOp):
+    __slots__ = ()
+
     symbol: ClassVar[str] = "**"
 
     def __init__(self, left: "Scalar", right: "Scalar") -> None:
-        super().__init__(left, right, lambda x, y: x**y)
+        super().__init__(left, right, left.data**right.data)
 
     @override
     def backward(self) -> None:
-        if self.left.data <= 0.0:
-            raise ValueError(
-                "Pow.backward requires a positive base for exponent gradients."
-            )
-
-        self.left.grad += (
-            self.right.data
-            * (self.left.data ** (self.right.data - 1.0))
-            * self.out.grad
-        )
-        self.right.grad += self.out.data * math.log(self.left.data) * self.out.grad
+        x, y = self.left.data, self.right.data
+        o, g = self.out.data, self.out.grad
+        literal = self.right.op is CONSTANT
+        self.left.grad += _pow_base_grad(x, y, o, literal) * g
+        if not literal:
+            self.right.grad += o * math.log(x) * g
 
 
 class Tanh(UnaryOp):
+    __slots__ = ()
+
     symbol: ClassVar[str] = "tanh"
 
     def __init__(self, operand: "Scalar") -> None:
-        super().__init__(operand, lambda x: math.tanh(x))
+        super().__init__(operand, math.tanh(operand.data))
 
     @override
     def backward(self) -> None:
-        self.operand.grad += (1 - (self.out.data**2)) * self.out.grad
+        y = self.out.data
+        self.operand.grad += (1.0 - y * y) * self.out.grad
 
 
 class Sigmoid(UnaryOp):
+    __slots__ = ()
+
     symbol: ClassVar[str] = "sigmoid"
 
     def __init__(self, operand: "Scalar") -> None:
-        super().__init__(operand, _sigmoid)
+        super().__init__(operand, _sigmoid(operand.data))
 
     @override
     def backward(self) -> None:
-        self.operand.grad += self.out.data * (1 - self.out.data) * self.out.grad
+        y, g = self.out.data, self.out.grad
+        self.operand.grad += y * (1 - y) * g
 
 
 class Relu(UnaryOp):
+    __slots__ = ()
+
     symbol: ClassVar[str] = "relu"
 
     def __init__(self, operand: "Scalar") -> None:
-        super().__init__(operand, lambda x: x if x > 0 else 0.0)
+        x = operand.data
+        super().__init__(operand, x if x > 0 else 0.0)
 
     @override
     def backward(self) -> None:
@@ -173,13 +223,52 @@ class Relu(UnaryOp):
             self.operand.grad += self.out.grad
 
 
+class Affine(Op):
+    __slots__ = ("weights", "inputs", "bias")
+
+    symbol: ClassVar[str] = "affine"
+
+    def __init__(
+        self,
+        weights: Sequence["Scalar"],
+        inputs: Sequence["Scalar"],
+        bias: "Scalar",
+    ) -> None:
+        if len(weights) != len(inputs):
+            raise ValueError(
+                f"Affine expects as many weights as inputs, "
+                f"got {len(weights)} and {len(inputs)}"
+            )
+
+        self.weights = tuple(weights)
+        self.inputs = tuple(inputs)
+        self.bias = bias
+        self.operands = (*self.weights, *self.inputs, bias)
+
+        dot = math.sumprod(
+            [w.data for w in self.weights], [x.data for x in self.inputs]
+        )
+        self.out = Scalar(bias.data + dot, op=self)
+
+    @override
+    def backward(self) -> None:
+        g = self.out.grad
+        for w, x in zip(self.weights, self.inputs):
+            w.grad += x.data * g
+            x.grad += w.data * g
+        self.bias.grad += g
+
+
 class Scalar:
-    __slots__ = ("data", "op", "grad")
+    __slots__ = ("data", "op", "grad", "mark", "pending", "_topo")
 
     def __init__(self, data: float, op: Op = NO_OP) -> None:
         self.data = data
         self.op = op
         self.grad = 0.0
+        # pending and _topo are only needed by backward, which sets them on first
+        # use, so they are left unset here.
+        self.mark = 0
 
     def __repr__(self) -> str:
         return f"{self.data}"
@@ -189,10 +278,12 @@ class Scalar:
         if isinstance(other, Scalar):
             return other
         if isinstance(other, (int, float)) and not isinstance(other, bool):
-            return Scalar(float(other))
+            return Scalar(float(other), op=CONSTANT)
         return None
 
     def __add__(self, other: object) -> "Scalar":
+        if type(other) is Scalar:
+            return Add(self, other).out
         right = self._coerce_binary_operand(other)
         if right is None:
             return NotImplemented
@@ -205,6 +296,8 @@ class Scalar:
         return Add(left, self).out
 
     def __sub__(self, other: object) -> "Scalar":
+        if type(other) is Scalar:
+            return Sub(self, other).out
         right = self._coerce_binary_operand(other)
         if right is None:
             return NotImplemented
@@ -217,6 +310,8 @@ class Scalar:
         return Sub(left, self).out
 
     def __mul__(self, other: object) -> "Scalar":
+        if type(other) is Scalar:
+            return Mul(self, other).out
         right = self._coerce_binary_operand(other)
         if right is None:
             return NotImplemented
@@ -229,6 +324,8 @@ class Scalar:
         return Mul(left, self).out
 
     def __truediv__(self, other: object) -> "Scalar":
+        if type(other) is Scalar:
+            return Div(self, other).out
         right = self._coerce_binary_operand(other)
         if right is None:
             return NotImplemented
@@ -241,6 +338,8 @@ class Scalar:
         return Div(left, self).out
 
     def __pow__(self, other: object) -> "Scalar":
+        if type(other) is Scalar:
+            return Pow(self, other).out
         right = self._coerce_binary_operand(other)
         if right is None:
             return NotImplemented
@@ -261,26 +360,40 @@ class Scalar:
     def relu(self) -> "Scalar":
         return Relu(self).out
 
-    def backward(self) -> None:
-        topo, visited, stack = [], set(), [(self, False)]
-
-        while stack:
-            node, expanded = stack.pop()
-            if expanded:
-                topo.append(node)
-                continue
+    def _topological_order(self) -> list["Scalar"]:
+        # Count how many ops in this graph consume each node, then run Kahn's
+        # algorithm from the root: a node is ready once every consumer has been
+        # emitted. Marks tag nodes already counted in this pass.
+        epoch = next(_EPOCHS)
+        self.mark, self.pending = epoch, 0
+        nodes: list[Scalar] = [self]
+        for node in nodes:
+            for operand in node.op.operands:
+                if operand.mark != epoch:
+                    operand.mark, operand.pending = epoch, 0
+                    nodes.append(operand)
+                operand.pending += 1
+
+        topo: list[Scalar] = []
+        ready: list[Scalar] = [self]
+        while ready:
+            node = ready.pop()
+            topo.append(node)
+            for operand in node.op.operands:
+                operand.pending -= 1
+                if not operand.pending:
+                    ready.append(operand)
+        return topo
 
-            if node in visited:
-                continue
+    def backward(self) -> None:
+        # Ops never change their operands, so the graph under a Scalar is fixed
+        # once built and its order can be cached for repeated backward calls.
+        topo = getattr(self, "_topo", None)
+        if topo is None:
+            topo = self._topo = self._topological_order()
 
+        for node in topo:
             node.grad = 0.0
-            visited.add(node)
-            stack.append((node, True))
-
-            for operand in reversed(node.op.operands):
-                if operand not in visited:
-                    stack.append((operand, False))
-
         self.grad = 1.0
-        for node in reversed(topo):
+        for node in topo:
             node.op.backward()
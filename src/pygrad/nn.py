@@ -1,6 +1,6 @@
 import random
 
-from pygrad.math import Scalar
+from pygrad.math import Affine, Scalar, Tanh
 
 
 class Neuron:
@@ -13,8 +13,15 @@ class Neuron:
             raise ValueError(
                 f"input shape mismatch: expected {len(self.weights)}, got {len(x)}"
             )
-        z = sum((wi * xi for wi, xi in zip(self.weights, x)), self.bias)
-        return z.tanh()
+        # Affine reads .data directly, so numbers are coerced up front the same
+        # way the arithmetic operators coerce them.
+        inputs = []
+        for xi in x:
+            operand = Scalar._coerce_binary_operand(xi)
+            if operand is None:
+                raise TypeError(f"unsupported input type: {type(xi).__name__}")
+            inputs.append(operand)
+        return Tanh(Affine(self.weights, inputs, self.bias).out).out
 
     def parameters(self) -> list[Scalar]:
         return self.weights + [self.bias]
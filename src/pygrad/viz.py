@@ -7,25 +7,26 @@ def render(root: Scalar, filename: str) -> None:
     dot = Digraph(format="svg")
     dot.attr(rankdir="LR")
 
-    queue, node_names = [root], set()
-    while len(queue):
-        node = queue.pop()
-        node_name = str(id(node))
-        if node_name in node_names:
+    stack, seen = [root], set()
+    while stack:
+        node = stack.pop()
+        node_id = id(node)
+        if node_id in seen:
             continue
-        node_names.add(node_name)
+        seen.add(node_id)
 
+        node_name = str(node_id)
         dot.node(node_name, label=str(node))
 
-        if not node.op.operands:
-            continue
         op = node.op
+        if not op.operands:
+            continue
 
         op_name = node_name + op.symbol
         dot.node(op_name, label=op.symbol)
         dot.edge(op_name, node_name)
         for operand in op.operands:
-            queue.append(operand)
+            stack.append(operand)
             dot.edge(str(id(operand)), op_name)
 
     dot.render(filename, cleanup=True)
@@ -0,0 +1,113 @@
+import pytest
+
+from pygrad.jit import trace
+from pygrad.math import Affine, Scalar
+from pygrad.nn import MLP
+
+
+def test_trace_forward_matches_graph_value() -> None:
+    x = Scalar(0.5)
+    y = Scalar(-1.5)
+    out = ((x * y + x**2) / (y - 3.0)).tanh() + x.sigmoid() + y.relu()
+
+    forward, _ = trace(out, [x, y])
+
+    assert forward(0.5, -1.5) == pytest.approx(out.data)
+
+
+def test_trace_backward_matches_scalar_backward() -> None:
+    x = Scalar(0.5)
+    y = Scalar(1.5)
+    out = ((x * y + x**y) / (y - 3.0)).tanh() + x.sigmoid() + (x - y).relu()
+    out.backward()
+
+    _, backward = trace(out, [x, y])
+
+    assert backward(0.5, 1.5) == pytest.approx([x.grad, y.grad])
+
+
+def test_trace_evaluates_new_input_values() -> None:
+    x = Scalar(2.0)
+    y = Scalar(3.0)
+    out = x * y + x
+
+    forward, backward = trace(out, [x, y])
+
+    assert forward(-1.0, 4.0) == pytest.approx(-5.0)
+    assert backward(-1.0, 4.0) == pytest.approx([5.0, -1.0])
+
+
+def test_trace_freezes_leaves_not_listed_as_inputs() -> None:
+    x = Scalar(2.0)
+    w = Scalar(3.0)
+    out = w * x
+
+    forward, backward = trace(out, [x])
+    w.data = 10.0
+
+    assert forward(1.0) == pytest.approx(3.0)
+    assert backward(1.0) == pytest.approx([3.0])
+
+
+def test_trace_returns_zero_gradient_for_unused_input() -> None:
+    x = Scalar(2.0)
+    unused = Scalar(5.0)
+    out = x * x
+
+    _, backward = trace(out, [x, unused])
+
+    assert backward(3.0, 1.0) == pytest.approx([6.0, 0.0])
+
+
+def test_trace_backward_matches_mlp_parameter_gradients() -> None:
+    mlp = MLP([2, 3, 1])
+    x = [Scalar(0.2), Scalar(-0.1)]
+    params = mlp.parameters()
+    out = mlp(x)[0]
+    out.backward()
+
+    _, backward = trace(out, params)
+
+    assert backward(*(p.data for p in params)) == pytest.approx(
+        [p.grad for p in params]
+    )
+
+
+def test_trace_forward_matches_wide_affine_exactly() -> None:
+    n = 10000
+    weights = [Scalar(0.1 + i * 1e-4) for i in range(n)]
+    inputs = [Scalar(-0.3 + i * 2e-4) for i in range(n)]
+    bias = Scalar(0.5)
+    out = Affine(weights, inputs, bias).out
+
+    forward, _ = trace(out, inputs)
+
+    assert forward(*(x.data for x in inputs)) == out.data
+
+
+def test_trace_backward_raises_like_engine_for_zero_base_pow() -> None:
+    x = Scalar(0.0)
+    out = x**0.5
+
+    _, backward = trace(out, [x])
+
+    with pytest.raises(ValueError, match=r"exponent of at least 1 for a zero base"):
+        backward(0.0)
+
+
+def test_trace_backward_raises_like_engine_for_negative_base_pow() -> None:
+    x = Scalar(-2.0)
+    out = x ** Scalar(2.0)
+
+    _, backward = trace(out, [x])
+
+    with pytest.raises(ValueError, match=r"positive base for exponent gradients"):
+        backward(-2.0)
+
+
+def test_trace_raises_for_non_leaf_input() -> None:
+    x = Scalar(2.0)
+    y = x * 3.0
+
+    with pytest.raises(ValueError, match=r"^inputs must be leaf scalars$"):
+        trace(y * y, [y])
@@ -7,6 +7,7 @@ import pytest
 
 from pygrad.math import (
     Add,
+    Affine,
     BinaryOp,
     Div,
     Mul,
@@ -266,6 +267,25 @@ def test_scalar_binary_operators_accept_int_and_float_on_left(
     assert actual.op.right is right
 
 
+def test_scalar_binary_operators_create_fresh_numeric_constant_scalars() -> None:
+    first = Scalar(2.0) * 3
+    second = 3.0 + Scalar(4.0)
+
+    assert isinstance(first.op, Mul)
+    assert isinstance(second.op, Add)
+    assert first.op.right is not second.op.left
+
+
+def test_scalar_binary_operators_keep_signed_zero_constants_distinct() -> None:
+    positive = Scalar(2.0) + 0.0
+    negative = Scalar(2.0) + -0.0
+
+    assert isinstance(positive.op, Add)
+    assert isinstance(negative.op, Add)
+    assert math.copysign(1.0, positive.op.right.data) == 1.0
+    assert math.copysign(1.0, negative.op.right.data) == -1.0
+
+
 @pytest.mark.parametrize(
     "binary_op",
     [operator.add, operator.sub, operator.mul, operator.truediv, operator.pow],
@@ -358,6 +378,41 @@ def test_unary_op_backward_accumulates_expected_gradient(
     assert operand.grad == pytest.approx(-0.5 + delta)
 
 
+def test_affine_out_is_bias_plus_weighted_sum() -> None:
+    weights = [Scalar(0.5), Scalar(-1.0)]
+    inputs = [Scalar(2.0), Scalar(-3.0)]
+    bias = Scalar(0.25)
+    op = Affine(weights, inputs, bias)
+
+    actual = op.out
+
+    assert isinstance(actual, Scalar)
+    assert actual.data == pytest.approx(4.25)
+    assert actual.op is op
+    assert op.operands == (*weights, *inputs, bias)
+
+
+def test_affine_backward_accumulates_expected_gradients() -> None:
+    weights = [Scalar(0.5), Scalar(-1.0)]
+    inputs = [Scalar(2.0), Scalar(-3.0)]
+    bias = Scalar(0.25)
+    op = Affine(weights, inputs, bias)
+    for s in (*weights, *inputs, bias):
+        s.grad = 1.0
+    op.out.grad = 2.0
+
+    op.backward()
+
+    assert [w.grad for w in weights] == pytest.approx([5.0, -5.0])
+    assert [x.grad for x in inputs] == pytest.approx([2.0, -1.0])
+    assert bias.grad == pytest.approx(3.0)
+
+
+def test_affine_raises_for_mismatched_lengths() -> None:
+    with pytest.raises(ValueError):
+        Affine([Scalar(1.0)], [Scalar(1.0), Scalar(2.0)], Scalar(0.0))
+
+
 @pytest.mark.parametrize(
     "operand_data",
     [1000.0, -1000.0],
@@ -386,6 +441,78 @@ def test_pow_backward_raises_value_error_for_non_positive_base() -> None:
         op.backward()
 
 
+@pytest.mark.parametrize(
+    ("base_data", "expected_grad"),
+    [(-1.5, -3.0), (0.0, 0.0), (2.0, 4.0)],
+    ids=["negative_base", "zero_base", "positive_base"],
+)
+def test_pow_backward_with_numeric_exponent_allows_any_base(
+    base_data: float, expected_grad: float
+) -> None:
+    base = Scalar(base_data)
+    out = base**2
+
+    out.backward()
+
+    assert base.grad == pytest.approx(expected_grad)
+
+
+@pytest.mark.parametrize(
+    ("exponent", "expected_grad"),
+    [(1, 1.0), (3, 0.0)],
+    ids=["linear", "cubic"],
+)
+def test_pow_backward_with_numeric_exponent_at_zero_base(
+    exponent: int, expected_grad: float
+) -> None:
+    base = Scalar(0.0)
+    out = base**exponent
+
+    out.backward()
+
+    assert base.grad == pytest.approx(expected_grad)
+
+
+def test_pow_backward_raises_value_error_for_zero_base_and_small_exponent() -> None:
+    out = Scalar(0.0) ** 0.5
+
+    with pytest.raises(
+        ValueError,
+        match=r"^Pow.backward requires an exponent of at least 1 for a zero base.$",
+    ):
+        out.backward()
+
+
+def test_pow_backward_with_zero_numeric_exponent_at_zero_base() -> None:
+    base = Scalar(0.0)
+    out = base**0
+
+    out.backward()
+
+    assert base.grad == 0.0
+
+
+def test_pow_backward_raises_value_error_for_negative_base_and_fraction() -> None:
+    out = Scalar(-2.0) ** 0.5
+
+    with pytest.raises(
+        ValueError,
+        match=r"^Pow.backward requires an integer exponent for a negative base.$",
+    ):
+        out.backward()
+
+
+def test_pow_backward_skips_gradient_for_numeric_exponent() -> None:
+    base = Scalar(2.0)
+    out = base**3
+    assert isinstance(out.op, Pow)
+
+    out.backward()
+
+    assert base.grad == pytest.approx(12.0)
+    assert out.op.right.grad == 0.0
+
+
 def test_scalar_backward_resets_existing_graph_gradients() -> None:
     left = Scalar(2.0)
     right = Scalar(3.0)
@@ -414,3 +541,17 @@ def test_scalar_backward_does_not_accumulate_across_calls() -> None:
 
     assert left.grad == pytest.approx(first_left_grad)
     assert right.grad == pytest.approx(first_right_grad)
+
+
+def test_scalar_backward_is_repeatable_after_subgraph_backward() -> None:
+    x = Scalar(3.0)
+    square = x * x
+    out = square * x + square
+    out.backward()
+    first_grad = x.grad
+
+    square.backward()
+    out.backward()
+
+    assert first_grad == pytest.approx(33.0)
+    assert x.grad == pytest.approx(first_grad)
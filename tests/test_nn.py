@@ -1,4 +1,5 @@
 import math
+from typing import Any
 
 import pytest
 
@@ -48,6 +49,37 @@ def test_neuron_call_raises_for_input_shape_mismatch() -> None:
         neuron([Scalar(2.0)])
 
 
+def test_neuron_call_coerces_numeric_inputs() -> None:
+    neuron = Neuron(2)
+    neuron.weights = [Scalar(0.5), Scalar(-1.0)]
+    neuron.bias = Scalar(0.25)
+
+    inputs: list[Any] = [2, -3.0]
+
+    expect = math.tanh(4.25)
+    actual = neuron(inputs)
+
+    assert actual.data == pytest.approx(expect)
+
+
+def test_neuron_call_raises_for_unsupported_input_type() -> None:
+    neuron = Neuron(2)
+    inputs: list[Any] = [Scalar(2.0), "3.0"]
+
+    with pytest.raises(TypeError, match=r"^unsupported input type: str$"):
+        neuron(inputs)
+
+
+def test_mlp_call_accepts_float_inputs() -> None:
+    mlp = MLP([2, 3, 1])
+    inputs: list[Any] = [1.0, 2.0]
+
+    actual = mlp(inputs)
+
+    assert len(actual) == 1
+    assert -1.0 < actual[0].data < 1.0
+
+
 def test_layer_call_applies_each_neuron_to_input() -> None:
     layer = Layer(2, 3)
     layer.neurons[0].weights = [Scalar(1.0), Scalar(0.0)]